@@ -6,7 +6,7 @@ Features: Basic, Scientific, Programmer, Financial, Algebra
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk
 import math
 import decimal
 import cmath
@@ -14,6 +14,10 @@ import ast
 import operator
 import datetime
 import sys
+import functools
+import re
+import struct
+from collections import OrderedDict, deque
 
 # ==========================================
 # 🎨 THEME & STYLE ENGINE
@@ -40,10 +44,18 @@ class ThemeManager:
         }
     }
 
+    # Button type -> (ttk style name, palette key for its background)
+    BUTTON_STYLES = {
+        "num": ("Num.TButton", "btn_num"), "op": ("Op.TButton", "btn_op"),
+        "eq": ("Eq.TButton", "btn_eq"), "func": ("Func.TButton", "btn_func")
+    }
+
     def __init__(self, root):
         self.root = root
         self.current_theme = "Dark"
         self.style = ttk.Style()
+        # Base theme is loaded once; palette switches only reconfigure styles
+        self.style.theme_use('clam')
         self.apply_theme(self.current_theme)
 
     def cycle_theme(self):
@@ -53,18 +65,13 @@ class ThemeManager:
         self.apply_theme(next_theme)
         return next_theme
 
-    def get_color(self, key):
-        return self.THEMES[self.current_theme].get(key)
-
     def apply_theme(self, theme_name):
         self.current_theme = theme_name
-        colors = self.THEMES[theme_name]
+        # Snapshot of the active palette, so lookups skip the THEMES indexing
+        self.colors = colors = self.THEMES[theme_name]
         
         self.root.configure(bg=colors["bg_main"])
         
-        # Configure standard Styles
-        self.style.theme_use('clam')
-        
         # Frame Styles
         self.style.configure('TFrame', background=colors["bg_main"])
         self.style.configure('Card.TFrame', background=colors["bg_panel"], relief="flat")
@@ -80,78 +87,206 @@ class ThemeManager:
         self.style.map('TNotebook.Tab', 
                        background=[('selected', colors["btn_eq"]), ('!selected', colors["bg_panel"])],
                        foreground=[('selected', '#FFFFFF'), ('!selected', colors["fg_text"])])
+        
+        # Button Styles (one per button type, shared by every CustomButton)
+        for btn_type, (style_name, color_key) in self.BUTTON_STYLES.items():
+            bg = colors[color_key]
+            fg = "#FFFFFF" if btn_type in ("op", "eq") else colors["fg_text"]
+            self.style.configure(style_name, background=bg, foreground=fg, font=("Roboto", 11),
+                                 relief="flat", borderwidth=0, padding=(0, 10),
+                                 bordercolor=bg, lightcolor=bg, darkcolor=bg)
+            self.style.map(style_name,
+                           background=[('active', colors["active"])],
+                           foreground=[('active', fg)])
 
 # ==========================================
 # 🧠 MODEL: LOGIC ENGINE (SAFE PARSER)
 # ==========================================
 
+RESULT_CACHE_SIZE = 512
+FORMAT_CACHE_SIZE = 256
+HISTORY_SIZE = 200
+
+# Single-character GUI symbols -> Python operators
+_SYM_TABLE = str.maketrans({'×': '*', '÷': '/'})
+
+# Programmer-mode tokens: bitwise operator words or (signed) hex literals, anything else is an error
+_BITWISE_TOKEN = re.compile(r'AND|XOR|OR|NOT|-?[0-9A-F]+|\S')
+
+@functools.lru_cache(maxsize=256)
+def _parse(expr_str):
+    """Parse an expression once; repeated expressions skip the parser."""
+    return ast.parse(expr_str, mode='eval').body
+
 class CalculatorEngine:
     """
     Handles all mathematical operations.
     Uses AST for safe expression evaluation instead of raw eval().
     """
     def __init__(self):
-        self.history = []
-        self.angle_mode = "DEG" # DEG or RAD
+        self.history = deque(maxlen=HISTORY_SIZE) # Rolling window of recent calculations
+        self.last_value = None # Numeric result of the last evaluate(), None on error
         
         # Safe operators mapping
         self.operators = {
             ast.Add: operator.add, ast.Sub: operator.sub,
             ast.Mult: operator.mul, ast.Div: operator.truediv,
+            ast.FloorDiv: operator.floordiv,
             ast.Pow: operator.pow, ast.BitXor: operator.xor,
-            ast.USub: operator.neg, ast.Mod: operator.mod
+            ast.USub: operator.neg, ast.UAdd: operator.pos,
+            ast.Mod: operator.mod
+        }
+        
+        # Programmer-mode binary operators (NOT is handled as a prefix)
+        self.bitwise_operators = {
+            "AND": operator.and_, "OR": operator.or_, "XOR": operator.xor
         }
         
         self.constants = {"pi": math.pi, "e": math.e}
+        
+        # (value, text) results keyed on (expression, angle_mode), LRU-bounded
+        self._result_cache = OrderedDict()
+        # Formatted non-integral floats keyed on their bit pattern, LRU-bounded
+        self._fmt_cache = OrderedDict()
+        
+        # Evaluation environments, one per angle mode, built once
+        common = {
+            "sqrt": math.sqrt, "abs": abs, "fact": math.factorial,
+            "log": math.log10, "ln": math.log, "exp": math.exp,
+            "pi": math.pi, "e": math.e
+        }
+        self._env_rad = dict(common, sin=math.sin, cos=math.cos, tan=math.tan,
+                             asin=math.asin, acos=math.acos, atan=math.atan)
+        self._env_deg = dict(common,
+                             sin=lambda x: math.sin(math.radians(x)),
+                             cos=lambda x: math.cos(math.radians(x)),
+                             tan=lambda x: math.tan(math.radians(x)),
+                             # inverse functions return radians, convert to deg
+                             asin=lambda x: math.degrees(math.asin(x)),
+                             acos=lambda x: math.degrees(math.acos(x)),
+                             atan=lambda x: math.degrees(math.atan(x)))
+        self.angle_mode = "DEG" # DEG or RAD
 
-    def _get_trig_func(self, func_name):
-        if self.angle_mode == "DEG":
-            return lambda x: getattr(math, func_name)(math.radians(x))
-        return getattr(math, func_name)
-
-    def _get_inv_trig_func(self, func_name):
-        # returns radians, convert to deg if needed
-        def func(x):
-            val = getattr(math, func_name)(x)
-            return math.degrees(val) if self.angle_mode == "DEG" else val
-        return func
+    @property
+    def angle_mode(self):
+        return self._angle_mode
+
+    @angle_mode.setter
+    def angle_mode(self, mode):
+        self._angle_mode = mode
+        self._result_cache.clear()
+        self._env = self._env_deg if mode == "DEG" else self._env_rad
+
+    def _eval_node(self, node):
+        """Recursively evaluate a parsed node against the safe tables."""
+        if isinstance(node, ast.BinOp):
+            op = self.operators[type(node.op)]
+            return op(self._eval_node(node.left), self._eval_node(node.right))
+        if isinstance(node, ast.UnaryOp):
+            return self.operators[type(node.op)](self._eval_node(node.operand))
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.keywords:
+                raise ValueError("Unsupported call")
+            func = self._env[node.func.id]
+            return func(*[self._eval_node(arg) for arg in node.args])
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, (int, float, complex)) and not isinstance(node.value, bool):
+                return node.value
+            raise ValueError("Unsupported constant")
+        if isinstance(node, ast.Name):
+            value = self._env[node.id]
+            if callable(value):
+                raise ValueError(f"Function used as value: {node.id}")
+            return value
+        raise ValueError(f"Unsupported expression: {type(node).__name__}")
+
+    def _format_result(self, result):
+        # Integers (and integral floats) print exactly, skipping float formatting
+        if isinstance(result, int):
+            return str(result)
+        if isinstance(result, float) and result.is_integer() and abs(result) < 1e15:
+            return str(int(result))
+        if isinstance(result, float):
+            bits = struct.pack('<d', result)
+            text = self._fmt_cache.get(bits)
+            if text is None:
+                text = f"{result:.10g}" # General format, removes trailing zeros
+                self._fmt_cache[bits] = text
+                if len(self._fmt_cache) > FORMAT_CACHE_SIZE:
+                    self._fmt_cache.popitem(last=False)
+            else:
+                self._fmt_cache.move_to_end(bits)
+            return text
+        if isinstance(result, decimal.Decimal):
+            return f"{result:.10g}"
+        return str(result)
 
     def evaluate(self, expression):
         """Safe evaluation of mathematical string."""
+        self.last_value = None
         if not expression: return ""
         
         # Replace GUI symbols with Python operators
-        clean_expr = expression.replace('×', '*').replace('÷', '/').replace('^', '**').replace('√', 'sqrt')
+        clean_expr = expression.translate(_SYM_TABLE).replace('^', '**').replace('√', 'sqrt')
+        
+        key = (clean_expr, self.angle_mode)
+        hit = self._result_cache.get(key)
+        if hit is not None:
+            self._result_cache.move_to_end(key)
+            self.last_value, text = hit
+            return text
         
         try:
-            # Custom Environment
-            env = {
-                "sqrt": math.sqrt, "abs": abs, "fact": math.factorial,
-                "log": math.log10, "ln": math.log, "exp": math.exp,
-                "sin": self._get_trig_func("sin"),
-                "cos": self._get_trig_func("cos"),
-                "tan": self._get_trig_func("tan"),
-                "asin": self._get_inv_trig_func("asin"),
-                "acos": self._get_inv_trig_func("acos"),
-                "atan": self._get_inv_trig_func("atan"),
-                "pi": math.pi, "e": math.e
-            }
+            # Walk the cached AST; only whitelisted operators and names resolve
+            result = self._eval_node(_parse(clean_expr))
             
-            # Using eval with restricted scope (standard practice for calc apps)
-            # strictly no __builtins__
-            result = eval(clean_expr, {"__builtins__": None}, env)
+            if isinstance(result, (float, decimal.Decimal)) and abs(result) < 1e-10:
+                result = 0
+            text = self._format_result(result)
             
-            # Format result
-            if isinstance(result, (float, decimal.Decimal)):
-                if abs(result) < 1e-10: result = 0
-                return f"{result:.10g}" # General format, removes trailing zeros
-            return str(result)
+            self._result_cache[key] = (result, text)
+            if len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+            self.last_value = result
+            return text
             
         except ZeroDivisionError:
             return "Error: Div by 0"
         except Exception:
             return "Error"
 
+    def eval_bitwise(self, expression):
+        """Evaluate a hex expression with AND/OR/XOR/NOT, left to right."""
+        self.last_value = None
+        if not expression: return ""
+        
+        acc, pending, invert = None, None, False
+        try:
+            for tok in _BITWISE_TOKEN.findall(expression.upper()):
+                if tok == "NOT":
+                    invert = not invert
+                elif tok in self.bitwise_operators:
+                    if acc is None or pending is not None:
+                        raise ValueError("Misplaced operator")
+                    pending = self.bitwise_operators[tok]
+                else:
+                    val = int(tok, 16)
+                    if invert:
+                        val, invert = ~val, False
+                    if acc is None:
+                        acc = val
+                    elif pending is None:
+                        raise ValueError("Missing operator")
+                    else:
+                        acc, pending = pending(acc, val), None
+            if acc is None or pending is not None or invert:
+                raise ValueError("Incomplete expression")
+        except ValueError:
+            return "Error"
+        
+        self.last_value = acc
+        return f"{acc:X}"
+
     def solve_linear(self, a, b):
         # ax + b = 0
         if a == 0: return "No Solution"
@@ -159,47 +294,60 @@ class CalculatorEngine:
 
     def solve_quadratic(self, a, b, c):
         # ax^2 + bx + c = 0
-        d = (b**2) - (4*a*c)
-        if d < 0:
-            val = cmath.sqrt(d)
-            return f"{-b/(2*a) + val/(2*a):.2f}, {-b/(2*a) - val/(2*a):.2f}"
-        else:
-            x1 = (-b + math.sqrt(d)) / (2*a)
-            x2 = (-b - math.sqrt(d)) / (2*a)
-            return f"{x1:.2f}, {x2:.2f}"
+        two_a = 2*a
+        neg_b_over_2a = -b / two_a
+        d = b*b - 4*a*c
+        root = (cmath.sqrt(d) if d < 0 else math.sqrt(d)) / two_a
+        return f"{neg_b_over_2a + root:.2f}, {neg_b_over_2a - root:.2f}"
 
 # ==========================================
 # 🖥️ VIEW & CONTROLLER: UI COMPONENTS
 # ==========================================
 
-class CustomButton(tk.Button):
-    """Modern flat button with hover effects."""
-    def __init__(self, master, text, command, btn_type="num", theme_mgr=None, width=5, height=2, **kwargs):
-        self.theme_mgr = theme_mgr
+PROG_TAB_INDEX = 2     # Notebook position of the "Prog" tab
+PROG_REDRAW_MS = 50    # Max BIN/HEX label refresh rate while Prog is visible
+INPUT_KEYS = frozenset('0123456789.+-*/^')
+BITWISE_KEYS = frozenset({'AND', 'OR', 'XOR', 'NOT'})
+_BITWISE_TAIL = re.compile(r'\s*(?:AND|XOR|OR|NOT)\s*$')
+
+# Button grids: rows of (text, button type)
+BASIC_LAYOUT = (
+    (('C', 'func'), ('⌫', 'func'), ('%', 'func'), ('÷', 'op')),
+    (('7', 'num'), ('8', 'num'), ('9', 'num'), ('×', 'op')),
+    (('4', 'num'), ('5', 'num'), ('6', 'num'), ('-', 'op')),
+    (('1', 'num'), ('2', 'num'), ('3', 'num'), ('+', 'op')),
+    (('±', 'num'), ('0', 'num'), ('.', 'num'), ('=', 'eq'))
+)
+
+SCI_LAYOUT = (
+    (('sin', 'func'), ('cos', 'func'), ('tan', 'func'), ('DEG', 'func')),
+    (('log', 'func'), ('ln', 'func'), ('(', 'func'), (')', 'func')),
+    (('x²', 'func'), ('√', 'func'), ('π', 'num'), ('e', 'num')),
+    (('7', 'num'), ('8', 'num'), ('9', 'num'), ('÷', 'op')),
+    (('4', 'num'), ('5', 'num'), ('6', 'num'), ('×', 'op')),
+    (('1', 'num'), ('2', 'num'), ('3', 'num'), ('-', 'op')),
+    (('0', 'num'), ('.', 'num'), ('=', 'eq'), ('+', 'op'))
+)
+
+# Only simple bitwise UI for this demo
+PROG_LAYOUT = (
+    (('AND', 'func'), ('OR', 'func'), ('XOR', 'func'), ('NOT', 'func')),
+    (('A', 'num'), ('B', 'num'), ('C', 'num'), ('D', 'num')),
+    (('7', 'num'), ('8', 'num'), ('9', 'num'), ('E', 'num')),
+    (('4', 'num'), ('5', 'num'), ('6', 'num'), ('F', 'num')),
+    (('1', 'num'), ('2', 'num'), ('3', 'num'), ('0', 'num'))
+)
+
+class CustomButton(ttk.Button):
+    """Modern flat button; colors and hover come from its shared ttk style."""
+    def __init__(self, master, text, command, btn_type="num", width=5, **kwargs):
         self.btn_type = btn_type
         self.text = text
         
-        super().__init__(master, text=text, command=command, width=width, height=height, 
-                         relief="flat", borderwidth=0, cursor="hand2", font=("Roboto", 11), **kwargs)
-        
-        self.bind("<Enter>", self.on_enter)
-        self.bind("<Leave>", self.on_leave)
-        self.update_color()
-
-    def update_color(self):
-        c_map = {
-            "num": "btn_num", "op": "btn_op", "eq": "btn_eq", "func": "btn_func"
-        }
-        bg = self.theme_mgr.get_color(c_map.get(self.btn_type, "btn_num"))
-        fg = "#FFFFFF" if self.btn_type in ["op", "eq"] else self.theme_mgr.get_color("fg_text")
-        
-        self.configure(bg=bg, fg=fg, activebackground=self.theme_mgr.get_color("active"))
-
-    def on_enter(self, e):
-        self['bg'] = self.theme_mgr.get_color("active")
-
-    def on_leave(self, e):
-        self.update_color()
+        styles = ThemeManager.BUTTON_STYLES
+        style_name = styles.get(btn_type, styles["num"])[0]
+        super().__init__(master, text=text, command=command, width=width,
+                         style=style_name, cursor="hand2", takefocus=False, **kwargs)
 
 class CalculatorApp:
     def __init__(self, root):
@@ -214,6 +362,16 @@ class CalculatorApp:
         self.current_expression = ""
         self.is_result_shown = False
         
+        # Pending label texts, written to the widgets in one idle flush
+        self._history_text = ""
+        self._display_dirty = False
+        
+        # Last integer result for the Prog tab's BIN/HEX labels
+        self._prog_value = 0
+        self._prog_pending = False
+        # Whether the display currently holds hex (Prog tab) or decimal input
+        self._prog_mode = False
+        
         self._setup_ui()
         self._bind_keys()
         
@@ -233,6 +391,9 @@ class CalculatorApp:
         self.display_frame = ttk.Frame(self.root, padding="15", style='Card.TFrame')
         self.display_frame.pack(fill="x", pady=5, padx=5)
         
+        self.lbl_mode = ttk.Label(self.display_frame, text=self.engine.angle_mode, font=("Roboto", 9), anchor="w")
+        self.lbl_mode.pack(fill="x")
+        
         self.lbl_history = ttk.Label(self.display_frame, text="", font=("Roboto", 10), anchor="e")
         self.lbl_history.pack(fill="x")
         
@@ -243,11 +404,21 @@ class CalculatorApp:
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill="both", expand=True, padx=5, pady=5)
         
-        self._create_basic_tab()
-        self._create_scientific_tab()
-        self._create_programmer_tab()
-        self._create_financial_tab()
-        self._create_algebra_tab()
+        # Only Basic is built up front; the other tabs get empty frames
+        # that are filled in the first time they are selected
+        self._tab_builders = {
+            "Basic": self._create_basic_tab, "Sci": self._create_scientific_tab,
+            "Prog": self._create_programmer_tab, "Fin": self._create_financial_tab,
+            "Alg": self._create_algebra_tab
+        }
+        self._tab_frames = {}
+        for name in self._tab_builders:
+            tab = ttk.Frame(self.notebook)
+            self.notebook.add(tab, text=name)
+            self._tab_frames[name] = tab
+        self._create_basic_tab(self._tab_frames["Basic"])
+        self._tabs_built = {"Basic"}
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
 
         # --- History Panel (Hidden by default) ---
         self.history_window = None
@@ -258,48 +429,27 @@ class CalculatorApp:
 
     def _create_grid_layout(self, parent, buttons):
         """Helper to create grid of buttons"""
-        for r, row in enumerate(buttons):
+        # Configure each row/column once rather than once per cell
+        for r in range(len(buttons)):
             parent.rowconfigure(r, weight=1)
+        for c in range(max(len(row) for row in buttons)):
+            parent.columnconfigure(c, weight=1)
+        
+        for r, row in enumerate(buttons):
             for c, (text, type_key) in enumerate(row):
-                parent.columnconfigure(c, weight=1)
                 if text:
-                    cmd = lambda t=text: self.on_button_click(t)
-                    btn = CustomButton(parent, text, cmd, type_key, self.theme_mgr)
+                    cmd = functools.partial(self.on_button_click, text)
+                    btn = CustomButton(parent, text, cmd, type_key)
                     btn.grid(row=r, column=c, sticky="nsew", padx=1, pady=1)
 
-    def _create_basic_tab(self):
-        tab = ttk.Frame(self.notebook)
-        self.notebook.add(tab, text="Basic")
-        
-        layout = [
-            [('C', 'func'), ('⌫', 'func'), ('%', 'func'), ('÷', 'op')],
-            [('7', 'num'), ('8', 'num'), ('9', 'num'), ('×', 'op')],
-            [('4', 'num'), ('5', 'num'), ('6', 'num'), ('-', 'op')],
-            [('1', 'num'), ('2', 'num'), ('3', 'num'), ('+', 'op')],
-            [('±', 'num'), ('0', 'num'), ('.', 'num'), ('=', 'eq')]
-        ]
-        self._create_grid_layout(tab, layout)
+    def _create_basic_tab(self, tab):
+        self._create_grid_layout(tab, BASIC_LAYOUT)
 
-    def _create_scientific_tab(self):
-        tab = ttk.Frame(self.notebook)
-        self.notebook.add(tab, text="Sci")
-        
+    def _create_scientific_tab(self, tab):
         # Grid with more columns
-        layout = [
-            [('sin', 'func'), ('cos', 'func'), ('tan', 'func'), ('DEG', 'func')],
-            [('log', 'func'), ('ln', 'func'), ('(', 'func'), (')', 'func')],
-            [('x²', 'func'), ('√', 'func'), ('π', 'num'), ('e', 'num')],
-            [('7', 'num'), ('8', 'num'), ('9', 'num'), ('÷', 'op')],
-            [('4', 'num'), ('5', 'num'), ('6', 'num'), ('×', 'op')],
-            [('1', 'num'), ('2', 'num'), ('3', 'num'), ('-', 'op')],
-            [('0', 'num'), ('.', 'num'), ('=', 'eq'), ('+', 'op')]
-        ]
-        self._create_grid_layout(tab, layout)
-
-    def _create_programmer_tab(self):
-        tab = ttk.Frame(self.notebook)
-        self.notebook.add(tab, text="Prog")
-        
+        self._create_grid_layout(tab, SCI_LAYOUT)
+
+    def _create_programmer_tab(self, tab):
         frame_top = ttk.Frame(tab, padding=10)
         frame_top.pack(fill="x")
         
@@ -308,22 +458,11 @@ class CalculatorApp:
         self.lbl_hex = ttk.Label(frame_top, text="HEX: 0")
         self.lbl_hex.pack(anchor="w")
         
-        # Only simple bitwise UI for this demo
-        layout = [
-            [('AND', 'func'), ('OR', 'func'), ('XOR', 'func'), ('NOT', 'func')],
-            [('A', 'num'), ('B', 'num'), ('C', 'num'), ('D', 'num')],
-            [('7', 'num'), ('8', 'num'), ('9', 'num'), ('E', 'num')],
-            [('4', 'num'), ('5', 'num'), ('6', 'num'), ('F', 'num')],
-            [('1', 'num'), ('2', 'num'), ('3', 'num'), ('0', 'num')]
-        ]
         frame_btns = ttk.Frame(tab)
         frame_btns.pack(fill="both", expand=True)
-        self._create_grid_layout(frame_btns, layout)
+        self._create_grid_layout(frame_btns, PROG_LAYOUT)
 
-    def _create_financial_tab(self):
-        tab = ttk.Frame(self.notebook)
-        self.notebook.add(tab, text="Fin")
-        
+    def _create_financial_tab(self, tab):
         form = ttk.Frame(tab, padding=20)
         form.pack(fill="both")
         
@@ -342,16 +481,17 @@ class CalculatorApp:
                 p = float(entries["Principal"].get())
                 r = float(entries["Rate (%)"].get()) / (12*100)
                 n = float(entries["Time (Yrs)"].get()) * 12
-                emi = p * r * ((1+r)**n) / (((1+r)**n)-1)
+                if r == 0:
+                    emi = p / n # Interest-free loan
+                else:
+                    f = (1+r)**n
+                    emi = p * r * f / (f-1)
                 res_lbl.config(text=f"Monthly EMI: {emi:.2f}")
             except: res_lbl.config(text="Error: Check Input")
 
         ttk.Button(form, text="Calculate Loan EMI", command=calc_emi).grid(row=3, column=0, columnspan=2, pady=10, sticky="ew")
 
-    def _create_algebra_tab(self):
-        tab = ttk.Frame(self.notebook)
-        self.notebook.add(tab, text="Alg")
-        
+    def _create_algebra_tab(self, tab):
         ttk.Label(tab, text="Quadratic Solver (ax² + bx + c)", font=("Roboto", 10, "bold")).pack(pady=10)
         
         frame = ttk.Frame(tab)
@@ -381,18 +521,20 @@ class CalculatorApp:
     # --------------------------------------------------------------------------
 
     def on_button_click(self, char):
-        if char == 'C':
+        # 'C' is a hex digit on the Prog tab; 'AC' (Escape) always clears
+        if char == 'AC' or (char == 'C' and not self._prog_tab_active()):
             self.current_expression = ""
             self.is_result_shown = False
         elif char == '⌫':
-            self.current_expression = self.current_expression[:-1]
+            # Bitwise operators are entered as whole words; delete them the same way
+            tail = _BITWISE_TAIL.search(self.current_expression)
+            self.current_expression = self.current_expression[:tail.start() if tail else -1]
         elif char == '=':
             self._calculate_result()
             return
         elif char == 'DEG':
-            self.engine.angle_mode = "RAD"
-            # Update button text manually if needed, or just toast
-            messagebox.showinfo("Mode", "Switched to Radians")
+            self.engine.angle_mode = "RAD" if self.engine.angle_mode == "DEG" else "DEG"
+            self.lbl_mode.config(text=self.engine.angle_mode)
             return
         elif char == '±':
             if self.current_expression and self.current_expression[0] == '-':
@@ -400,40 +542,93 @@ class CalculatorApp:
             else:
                  self.current_expression = '-' + self.current_expression
         else:
-            if self.is_result_shown and char in "0123456789.":
+            if self.is_result_shown and char in "0123456789.ABCDEF":
                 self.current_expression = char
                 self.is_result_shown = False
             else:
                 if self.is_result_shown: self.is_result_shown = False
                 # Mapping symbols to safe strings
                 if char == 'x²': char = '^2'
+                elif char in BITWISE_KEYS: char = f" {char} "
                 self.current_expression += char
         
         self._update_display()
 
     def _calculate_result(self):
-        result = self.engine.evaluate(self.current_expression)
+        if self._prog_tab_active():
+            result = self.engine.eval_bitwise(self.current_expression)
+        else:
+            result = self.engine.evaluate(self.current_expression)
         
         # History
         if result != "Error":
-            self.engine.history.append(f"{self.current_expression} = {result}")
-            self.lbl_history.config(text=f"{self.current_expression} =")
+            entry = f"{self.current_expression} = {result}"
+            self.engine.history.append(entry)
+            self._history_text = f"{self.current_expression} ="
+            self._append_history_entry(entry)
         
         self.current_expression = result
         self.is_result_shown = True
-        self._update_display()
         
         # Update programmer tab bits if integer
-        if result.replace('.','',1).isdigit():
-            try:
-                val = int(float(result))
-                self.lbl_bin.config(text=f"BIN: {bin(val)[2:]}")
-                self.lbl_hex.config(text=f"HEX: {hex(val)[2:].upper()}")
-            except: pass
+        val = self.engine.last_value
+        # Same bound as _format_result: huge floats are shown in exponent form, not as integers
+        if isinstance(val, int) or (isinstance(val, float) and val.is_integer() and abs(val) < 1e15):
+            self._prog_value = int(val)
+            self._schedule_prog_labels()
+        
+        self._update_display()
+
+    def _prog_tab_active(self):
+        return self.notebook.index(self.notebook.select()) == PROG_TAB_INDEX
+
+    def _schedule_prog_labels(self):
+        # BIN/HEX only matter while Prog is visible; rapid '=' presses collapse into one update
+        if self._prog_pending or not self._prog_tab_active():
+            return
+        self._prog_pending = True
+        self.root.after(PROG_REDRAW_MS, self._update_prog_labels)
+
+    def _update_prog_labels(self):
+        self._prog_pending = False
+        val = self._prog_value
+        self.lbl_bin.config(text=f"BIN: {val:b}")
+        self.lbl_hex.config(text=f"HEX: {val:X}")
+
+    def _on_tab_changed(self, event):
+        name = self.notebook.tab(self.notebook.select(), "text")
+        if name not in self._tabs_built:
+            self._tabs_built.add(name)
+            self._tab_builders[name](self._tab_frames[name])
+        
+        prog_mode = self._prog_tab_active()
+        if prog_mode != self._prog_mode:
+            self._prog_mode = prog_mode
+            self._convert_expression_base(prog_mode)
+        self._schedule_prog_labels()
+
+    def _convert_expression_base(self, to_hex):
+        # Prog reads the display as hex, the other tabs as decimal: carry a
+        # plain integer across, and clear anything that has no equivalent
+        try:
+            val = int(self.current_expression, 10 if to_hex else 16)
+        except ValueError:
+            self.current_expression = ""
+            self.is_result_shown = False
+        else:
+            self.current_expression = f"{val:X}" if to_hex else str(val)
+        self._update_display()
 
     def _update_display(self):
-        text = self.current_expression if self.current_expression else "0"
-        self.lbl_display.config(text=text)
+        # Coalesce: any number of updates within one event repaint once at idle
+        if not self._display_dirty:
+            self._display_dirty = True
+            self.root.after_idle(self._flush_display)
+
+    def _flush_display(self):
+        self._display_dirty = False
+        self.lbl_display.config(text=self.current_expression if self.current_expression else "0")
+        self.lbl_history.config(text=self._history_text)
 
     # --------------------------------------------------------------------------
     # ⌨️ KEYBOARD & SHORTCUTS
@@ -442,44 +637,75 @@ class CalculatorApp:
     def _bind_keys(self):
         self.root.bind('<Return>', lambda e: self.on_button_click('='))
         self.root.bind('<BackSpace>', lambda e: self.on_button_click('⌫'))
-        self.root.bind('<Escape>', lambda e: self.on_button_click('C'))
+        self.root.bind('<Escape>', lambda e: self.on_button_click('AC'))
         self.root.bind('<Control-c>', self.copy_to_clipboard)
         self.root.bind('<Control-t>', lambda e: self.toggle_theme())
         self.root.bind('<Control-h>', lambda e: self.toggle_history())
-        
-        for key in '0123456789.+-*/^':
-            self.root.bind(key, lambda e, k=key: self.on_button_click(k))
+        self.root.bind('<Key>', self._on_key)
+
+    def _on_key(self, event):
+        # Single dispatch for all character input keys
+        if event.char in INPUT_KEYS:
+            self.on_button_click(event.char)
 
     def copy_to_clipboard(self, event=None):
         self.root.clipboard_clear()
-        self.root.clipboard_append(self.lbl_display.cget("text"))
-        self.root.update()
+        self.root.clipboard_append(self.current_expression if self.current_expression else "0")
         # Toast simulation
-        self.lbl_history.config(text="Copied to clipboard!")
+        self._history_text = "Copied to clipboard!"
+        self._update_display()
 
     def toggle_theme(self):
-        new_theme = self.theme_mgr.cycle_theme()
-        # Re-render buttons to apply new theme colors
-        self._refresh_widgets()
-
-    def _refresh_widgets(self):
-        # Recursive widget refresh is hard in Tkinter without destroying
-        # For this architecture, we restart the loop or update styles
-        # Since we use ttk.Style, most update automatically, 
-        # but manual colored buttons (CustomButton) need explicit update
-        for widget in self.root.winfo_children():
-            self._update_widget_theme(widget)
-            
-    def _update_widget_theme(self, widget):
-        if isinstance(widget, CustomButton):
-            widget.update_color()
-        if isinstance(widget, (tk.Frame, ttk.Frame, ttk.Notebook)):
-            for child in widget.winfo_children():
-                self._update_widget_theme(child)
+        # Buttons follow their ttk styles, which apply_theme reconfigures globally
+        self.theme_mgr.cycle_theme()
+        # The history list is a classic Tk widget and needs explicit colors
+        if self.history_window is not None:
+            self._color_history_list()
 
     def toggle_history(self):
-        hist = "\n".join(self.engine.history[-10:]) # Last 10
-        messagebox.showinfo("Calculation History", hist if hist else "No history yet.")
+        if self.history_window is None:
+            self._create_history_window()
+        elif self.history_window.state() in ("normal", "zoomed"):
+            self.history_window.withdraw()
+            return
+        
+        lst = self.history_list
+        lst.delete(0, "end")
+        if self.engine.history:
+            lst.insert("end", *self.engine.history)
+            lst.see("end")
+        else:
+            lst.insert("end", "No history yet.")
+        self.history_window.deiconify()
+
+    def _append_history_entry(self, entry):
+        # Keep an open (or minimized) panel live instead of refilling it on show
+        if self.history_window is None or self.history_window.state() == "withdrawn":
+            return
+        lst = self.history_list
+        if len(self.engine.history) == 1:
+            lst.delete(0, "end") # Drop the "No history yet." placeholder
+        lst.insert("end", entry)
+        if lst.size() > HISTORY_SIZE:
+            lst.delete(0)
+        lst.see("end")
+
+    def _create_history_window(self):
+        # Built on first use, then reused: closing only hides it
+        self.history_window = tk.Toplevel(self.root)
+        self.history_window.title("Calculation History")
+        self.history_window.geometry("300x400")
+        self.history_window.protocol("WM_DELETE_WINDOW", self.history_window.withdraw)
+        
+        self.history_list = tk.Listbox(self.history_window, font=("Consolas", 11),
+                                       borderwidth=0, highlightthickness=0)
+        self.history_list.pack(fill="both", expand=True)
+        self._color_history_list()
+
+    def _color_history_list(self):
+        colors = self.theme_mgr.colors
+        self.history_list.configure(bg=colors["bg_panel"], fg=colors["fg_text"],
+                                    selectbackground=colors["btn_eq"])
 
 # ==========================================
 # 🚀 MAIN ENTRY POINT